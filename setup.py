@@ -5,26 +5,41 @@ import os
 import re
 import sys
 import platform
+import shutil
 import subprocess
 from pathlib import Path
 
 from setuptools import setup, Extension
 from setuptools.command.build_ext import build_ext
-from distutils.version import LooseVersion
 
 # Intended to make building in manylinux images easier.
 # CentOS (or the EPEL package?) calls CMake cmake3...
 cmake3_path = Path("/usr/bin/cmake3")
 cmake_name = "cmake3" if cmake3_path.exists() else "cmake"
 
+# NAME:TYPE=VALUE
+CMAKE_CACHE_ENTRY_RE = re.compile(r'^([^#/][^:=]*)(?::[^=]*)?=(.*)$')
+
+# Created in the build directory once a configure step has completed successfully.
+CONFIGURED_MARKER = '.oead_configured'
+
 class CMakeExtension(Extension):
     def __init__(self, name, sourcedir=''):
-        Extension.__init__(self, name, sources=[str(p) for p in Path(sourcedir).glob('**/*')])
+        # setuptools only needs a stable source list; CMake does the actual dependency tracking.
+        # Walking the whole tree would also pick up build artifacts and caches.
+        sources = [str(p) for pattern in ('*.cpp', '*.h', 'CMakeLists.txt')
+                   for p in sorted(Path(sourcedir).glob(pattern))]
+        Extension.__init__(self, name, sources=sources)
         self.sourcedir = os.path.abspath(sourcedir)
 
 
 class CMakeBuild(build_ext):
     def run(self):
+        # PEP 660 editable installs (pip install -e .) get a fresh temporary build_temp on
+        # every run, which would force a full configure and rebuild each time.
+        if getattr(self, 'editable_mode', False):
+            self.build_temp = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build',
+                                           'temp.editable')
         for ext in self.extensions:
             self.build_extension(ext)
 
@@ -36,23 +51,91 @@ class CMakeBuild(build_ext):
                       '-DPYTHON_EXECUTABLE=' + sys.executable]
 
         cfg = 'Debug' if debug else 'Release'
-        build_args = [f'-j{os.cpu_count()}', '--config', cfg]
+        build_args = ['--config', cfg]
 
         if platform.system() == "Windows":
             cmake_args += ['-DCMAKE_LIBRARY_OUTPUT_DIRECTORY_{}={}'.format(cfg.upper(), extdir)]
             if sys.maxsize > 2**32:
                 cmake_args += ['-A', 'x64']
-            build_args += ['--', '/m']
         else:
             cmake_args += ['-DCMAKE_BUILD_TYPE=' + cfg]
 
         env = os.environ.copy()
+        # Generator-agnostic parallelism (Make, Ninja and MSBuild all honour this).
+        # MAX_JOBS takes precedence so that memory-constrained builders can limit it.
+        env['CMAKE_BUILD_PARALLEL_LEVEL'] = (env.get('MAX_JOBS')
+                                             or env.get('CMAKE_BUILD_PARALLEL_LEVEL')
+                                             or str(os.cpu_count()))
         env['CXXFLAGS'] = '{} -DVERSION_INFO=\\"{}\\"'.format(env.get('CXXFLAGS', ''),
                                                               self.distribution.get_version())
+        # Always pass the launcher explicitly (empty if disabled) so that turning the option
+        # off also clears the value from an existing CMake cache.
+        launcher = ''
+        if os.getenv('OEAD_USE_CCACHE') == '1':
+            for launcher, cache_dir_var in (('ccache', 'CCACHE_DIR'), ('sccache', 'SCCACHE_DIR')):
+                if shutil.which(launcher):
+                    # Keep the cache inside the project so that CI can persist it.
+                    env.setdefault(cache_dir_var,
+                                   os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '.ccache'))
+                    break
+            else:
+                raise RuntimeError("OEAD_USE_CCACHE is set but neither ccache nor sccache was found")
+        cmake_args += ['-DCMAKE_C_COMPILER_LAUNCHER=' + launcher,
+                       '-DCMAKE_CXX_COMPILER_LAUNCHER=' + launcher]
+
+        # Batch oead's translation units together to cut per-process compiler overhead.
+        # Requires CMake 3.16+. File-local (static or anonymous namespace) symbols
+        # with the same name in different .cpp files will clash in a unity build.
+        # Always passed explicitly so that turning the option off takes effect.
+        unity_build = 'ON' if os.getenv('OEAD_UNITY_BUILD') == '1' else 'OFF'
+        cmake_args += ['-DOEAD_UNITY_BUILD=' + unity_build]
+
         if not os.path.exists(self.build_temp):
             os.makedirs(self.build_temp)
-        subprocess.check_call([cmake_name, ext.sourcedir] + cmake_args, cwd=self.build_temp, env=env)
-        subprocess.check_call([cmake_name, '--build', '.'] + build_args, cwd=self.build_temp)
+
+        try:
+            # The build step re-runs CMake by itself if any CMakeLists.txt has changed,
+            # so an explicit configure is only needed when the cached arguments differ.
+            if not self.is_configured(ext, cmake_args):
+                # CMake writes CMakeCache.txt even if configuring fails, so keep track of
+                # whether the last configure finished with a separate marker file.
+                marker_path = Path(self.build_temp, CONFIGURED_MARKER)
+                if marker_path.exists():
+                    marker_path.unlink()
+                subprocess.check_call([cmake_name, ext.sourcedir] + cmake_args,
+                                      cwd=self.build_temp, env=env)
+                marker_path.touch()
+            subprocess.check_call([cmake_name, '--build', '.'] + build_args,
+                                  cwd=self.build_temp, env=env)
+        except FileNotFoundError:
+            raise RuntimeError("CMake must be installed to build the following extensions: " +
+                               ext.name)
+
+    def is_configured(self, ext, cmake_args):
+        cache_path = Path(self.build_temp) / 'CMakeCache.txt'
+        if not cache_path.exists() or not Path(self.build_temp, CONFIGURED_MARKER).exists():
+            return False
+
+        cache = dict()
+        with cache_path.open('r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                match = CMAKE_CACHE_ENTRY_RE.match(line.rstrip('\n'))
+                if match:
+                    cache[match.group(1)] = match.group(2)
+
+        expected = {'CMAKE_HOME_DIRECTORY': Path(ext.sourcedir).as_posix()}
+        args = iter(cmake_args)
+        for arg in args:
+            if arg == '-A':
+                expected['CMAKE_GENERATOR_PLATFORM'] = next(args)
+            elif arg.startswith('-D'):
+                key, _, value = arg[2:].partition('=')
+                expected[key.split(':')[0]] = value
+            else:
+                return False
+
+        return all(cache.get(key) == value for key, value in expected.items())
 
 
 with open("readme.rst", "r") as fh:
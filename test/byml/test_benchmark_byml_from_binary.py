@@ -14,7 +14,7 @@ def byml_parse(data):
 @pytest.mark.parametrize("file", cases)
 def test_parse_byml(benchmark, file):
     benchmark.group = "parse: " + file
-    benchmark(byml_parse, data[file])
+    benchmark(byml_parse, bytes(data[file]))
 
 
 @pytest.mark.parametrize("file", cases)
@@ -20,7 +20,7 @@ def oead_to_bin(instance):
 @pytest.mark.parametrize("file", cases)
 def test_to_bin_byml(benchmark, file):
     benchmark.group = "to bin: " + file
-    x = byml.Byml(data[file]).parse()
+    x = byml.Byml(bytes(data[file])).parse()
     benchmark(byml_to_bin, x)
 
 
@@ -23,7 +23,7 @@ def oead_to_text(instance):
 @pytest.mark.parametrize("file", cases)
 def test_to_text_byml(benchmark, file):
     benchmark.group = "to text: " + file
-    x = byml.Byml(data[file]).parse()
+    x = byml.Byml(bytes(data[file])).parse()
     benchmark(byml_to_text, x)
 
 
@@ -1,14 +1,55 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
+import atexit
+import hashlib
+import mmap
+import os
+import tempfile
+import oead
 import pytest
 
+# Files whose consumers need bytes or str objects rather than any buffer are always read
+# into memory: text parsers, and oead.gsheet.parse (which takes an oead.Bytes).
+READ_SUFFIXES = {".yml", ".gsheet"}
 
+_mapped_files = []
+
+
+@atexit.register
+def _close_mapped_files():
+    for view, mapping in _mapped_files:
+        with suppress(BufferError):
+            view.release()
+            mapping.close()
+
+
+def _load_test_file(path):
+    """Returns the contents of a test file.
+
+    Binary files are memory-mapped and returned as read-only memoryviews,
+    which support the buffer protocol and compare equal to bytes.
+    """
+    with path.open("rb") as f:
+        if path.suffix in READ_SUFFIXES or os.fstat(f.fileno()).st_size == 0:
+            return f.read()
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    _mapped_files.append((view, mapping))
+    return view
+
+
+@lru_cache(maxsize=None)
 def make_test_cases(pattern):
     array_cases = []
     array_data = dict()
-    for path in (Path(__file__).parent.parent).glob(pattern):
-        with path.open("rb") as f:
+    paths = sorted((Path(__file__).parent.parent).glob(pattern))
+    # Loading is I/O-bound, so threads can overlap the syscalls despite the GIL.
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(paths)))) as executor:
+        for path, contents in zip(paths, executor.map(_load_test_file, paths)):
             array_cases.append(pytest.param(path.name, id='/'))
-            array_data[path.name] = f.read()
+            array_data[path.name] = contents
     return (array_cases, array_data)
 
 
@@ -22,6 +63,7 @@ def make_test_cases_from_file_list(files):
             array_data[path.name] = f.read()
     return (array_cases, array_data)
 
+@lru_cache(maxsize=None)
 def make_test_cases_aamp():
     return make_test_cases_from_file_list([
         Path("aamp") / "files" / "normal.bwinfo",
@@ -34,3 +76,53 @@ def make_test_cases_aamp():
         Path("aamp") / "files" / "AIProgram" / "Player_Link.baiprog",
         Path("aamp") / "files" / "AIProgram" / "Horse.baiprog",
     ])
+
+
+def aamp_to_text(data):
+    return oead.aamp.ParameterIO.from_binary(data).to_text()
+
+
+def _get_oead_build_id():
+    # oead does not expose a version attribute, so identify the build by its extension module.
+    stat = os.stat(oead.__file__)
+    return "{}:{}:{}".format(oead.__file__, stat.st_mtime_ns, stat.st_size).encode()
+
+
+def make_aamp_text_data(data, cache_dir):
+    """Converts binary AAMP test data to text.
+
+    Conversions are done in parallel and persisted to cache_dir, keyed by a hash of
+    the binary contents and of the oead build, so that subsequent test sessions only
+    need to convert files that were added or modified (or all of them after oead is
+    rebuilt).
+    """
+    build_id = _get_oead_build_id()
+    text_data = dict()
+    missing = []
+    for name, contents in data.items():
+        key = hashlib.blake2b(digest_size=16)
+        key.update(build_id)
+        key.update(contents)
+        cache_path = Path(cache_dir) / (key.hexdigest() + ".yml")
+        if cache_path.exists():
+            text_data[name] = cache_path.read_text(encoding="utf-8")
+        else:
+            missing.append((name, cache_path))
+
+    if missing:
+        with ProcessPoolExecutor() as executor:
+            texts = executor.map(aamp_to_text, [data[name] for name, _ in missing])
+            for (name, cache_path), text in zip(missing, texts):
+                # Write atomically so that an interrupted or concurrent run cannot leave
+                # a truncated file behind.
+                fd, tmp_path = tempfile.mkstemp(dir=str(cache_path.parent), suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(text)
+                    os.replace(tmp_path, str(cache_path))
+                except BaseException:
+                    with suppress(OSError):
+                        os.remove(tmp_path)
+                    raise
+                text_data[name] = text
+    return text_data